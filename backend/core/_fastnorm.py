@@ -0,0 +1,31 @@
+# backend/core/_fastnorm.py
+
+"""SQL text normalization hot path.
+
+Kept in its own module with full type annotations so it can be compiled
+with mypyc (`mypycify(['core/_fastnorm.py'])`) once the project grows a
+build step; the pure-Python form is used as-is until then.
+"""
+
+import re
+
+# ASCII-only lowercase table; SQL keywords and identifiers here are ASCII,
+# so bytes.translate replaces the unicode-aware str.lower path
+_LOWER_TABLE = bytes.maketrans(bytes(range(0x41, 0x5B)), bytes(range(0x61, 0x7B)))
+_WS_RE = re.compile(rb'\s+')
+
+
+def normalize_sql(sql: str) -> str:
+    """Lowercase and collapse all whitespace runs to single spaces
+
+    Works on bytes internally: one translate for case folding plus one
+    C-level regex sub for whitespace, instead of the lower/split/join
+    trio and its intermediate list and string allocations. Queries with
+    non-ASCII characters (e.g. in string literals) take the str path:
+    encoding them with 'ignore' would drop those characters and equate
+    queries that differ only inside such literals.
+    """
+    if not sql.isascii():
+        return ' '.join(sql.lower().split())
+    buf = sql.encode('ascii').translate(_LOWER_TABLE)
+    return _WS_RE.sub(b' ', buf).strip().decode('ascii')
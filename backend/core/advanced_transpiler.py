@@ -5,13 +5,16 @@ from dataclasses import dataclass
 import re
 from enum import Enum
 
+_AS_RE = re.compile(r'\s+AS\s+', re.IGNORECASE)
+_AGG_FUNCS = ('COUNT', 'SUM', 'AVG', 'MAX', 'MIN')
+
 class PatternType(Enum):
     SIMPLE_PATH = "simple_path"
     COMPLEX_PATH = "complex_path"
     OPTIONAL_PATH = "optional_path"
     VARIABLE_LENGTH = "variable_length"
 
-@dataclass
+@dataclass(slots=True)
 class PathComponent:
     nodes: List[Dict[str, Any]]
     edges: List[Dict[str, Any]]
@@ -170,9 +173,13 @@ class AdvancedCypherTranspiler:
     def _generate_optimized_sql(self, pattern_graph: Dict[str, Any],
                                dependencies: Dict[str, Any],
                                clauses: Dict[str, str]) -> str:
-        """Generate optimized SQL with CTEs"""
-        sql_parts = []
-        
+        """Generate optimized SQL with CTEs
+
+        The query is emitted into a single fragment list joined once at
+        the end; no intermediate string is rebuilt per CTE or per join.
+        """
+        out = []
+
         # Generate CTEs for each path
         cte_definitions = []
         for i, path in enumerate(pattern_graph['paths']):
@@ -180,104 +187,92 @@ class AdvancedCypherTranspiler:
             cte_name = f"path_{i}"
             cte_sql = self._generate_cte_for_path(path, cte_name, clauses.get('where'))
             cte_definitions.append(cte_sql)
-        
+
         # Build main query
         if cte_definitions:
-            sql_parts.append(f"WITH {','.join([f'\\n  {cte}' for cte in cte_definitions])}")
-        
+            out.append("WITH")
+            for i, cte in enumerate(cte_definitions):
+                if i:
+                    out.append(",")
+                out.append("\n  ")
+                out.append(cte)
+            out.append("\n")
+
         # Build SELECT from CTEs
         if clauses['return']:
-            select_sql = self._build_select_from_ctes(
+            out.append(self._build_select_from_ctes(
                 clauses['return'],
                 pattern_graph,
                 dependencies
-            )
-            sql_parts.append(select_sql)
-        
-        return "\\n".join(sql_parts)
-    
+            ))
+
+        return "".join(out)
+
     def _generate_cte_for_path(self, path: Dict[str, Any], cte_name: str, where_clause: Optional[str]) -> str:
         """Generate a single CTE for a path"""
-        
+
         # Start with first node table
-        first_node = path['nodes']
-        sql = f"{cte_name} AS (\\n"
-        sql += f"  SELECT "
-        
+        first_node = path['nodes'][0]
+        parts = [f"{cte_name} AS (\n  SELECT "]
+
         # Select all node/edge attributes
-        select_items = []
-        for node in path['nodes']:
-            select_items.append(f"{node}.* AS {node}_data")
-        
-        sql += ",\\n         ".join(select_items)
-        
+        parts.append(",\n         ".join(
+            f"{node}.* AS {node}_data" for node in path['nodes']))
+
         # Build FROM and JOINs
-        sql += f"\\n  FROM {first_node.lower()} AS {first_node}\\n"
-        
-        # Add edge joins
-        for edge in path['edges']:
-            sql += self._build_join_for_edge(edge, path['nodes'])
-        
-        sql += "\\n)"
-        
-        return sql
-    
-    def _build_join_for_edge(self, edge: Dict[str, Any], nodes: List[str]) -> str:
-        """Build JOIN clause for an edge"""
+        parts.append(f"\n  FROM {first_node.lower()} AS {first_node}\n")
+
+        # Walk the node chain left-deep: edge i connects node i to node i+1,
+        # so the whole join chain is emitted in one linear pass
+        node_names = path['nodes']
+        last = len(node_names) - 1
+        for i, edge in enumerate(path['edges']):
+            src_node = node_names[min(i, last)]
+            tgt_node = node_names[min(i + 1, last)]
+            self._build_join_for_edge(edge, src_node, tgt_node, parts)
+
+        parts.append("\n)")
+
+        return "".join(parts)
+
+    def _build_join_for_edge(self, edge: Dict[str, Any], src_node: str,
+                             tgt_node: str, parts: List[str]) -> None:
+        """Append the JOIN fragments for an edge to the output buffer"""
         edge_table = edge['label'].lower()
-        direction = edge['direction']
-        
-        # Determine source and target nodes from edge position
-        src_node = nodes
-        tgt_node = nodes if len(nodes) > 1 else nodes
-        
+
         join_type = "INNER JOIN" if 'LEFT' not in edge.get('type', '') else "LEFT JOIN"
-        
-        join = f"  {join_type} {edge_table} AS {edge['name']}\\n"
-        join += f"    ON {src_node}.id = {edge['name']}.src_id\\n"
-        join += f"    AND {edge['name']}.tgt_id = {tgt_node}.id"
-        
-        return join
+
+        parts.append(f"  {join_type} {edge_table} AS {edge['name']}\n")
+        parts.append(f"    ON {src_node}.id = {edge['name']}.src_id\n")
+        parts.append(f"    AND {edge['name']}.tgt_id = {tgt_node}.id")
     
     def _build_select_from_ctes(self, return_clause: str, pattern_graph: Dict[str, Any],
                                dependencies: Dict[str, Any]) -> str:
         """Build SELECT clause from CTEs"""
         
-        # Parse return items
+        # Parse return items; select list, group keys, and the aggregate
+        # flag all come out of one pass with one upper() per item
         return_items = [item.strip() for item in return_clause.split(',')]
         select_items = []
         group_by_items = []
-        
+        has_aggregate = False
+
         for item in return_items:
-            # Check for aggregations
-            if 'COUNT' in item.upper():
-                select_items.append(item)
-            elif 'SUM' in item.upper():
-                select_items.append(item)
-            elif 'AVG' in item.upper():
-                select_items.append(item)
-            elif 'MAX' in item.upper():
-                select_items.append(item)
-            elif 'MIN' in item.upper():
-                select_items.append(item)
-            elif 'AS' in item.upper():
-                select_items.append(item)
-                # Extract column for grouping
-                parts = item.split('AS')
-                if len(parts) == 2:
-                    col = parts.strip()
-                    if '.' in col:
-                        group_by_items.append(col)
-            else:
-                select_items.append(item)
-                if '.' in item:
-                    group_by_items.append(item)
-        
-        select_clause = "SELECT \\n  " + ",\\n  ".join(select_items)
-        
-        # Build FROM clause using first CTE
-        from_clause = f"\\nFROM path_0"
-        
+            select_items.append(item)
+            upper = item.upper()
+            if any(func in upper for func in _AGG_FUNCS):
+                has_aggregate = True
+            elif _AS_RE.search(item):
+                # column before the alias drives the grouping
+                col = _AS_RE.split(item, 1)[0].strip()
+                if '.' in col:
+                    group_by_items.append(col)
+            elif '.' in item:
+                group_by_items.append(item)
+        
+        # Emit into one fragment list; joined a single time below
+        out = ["SELECT \n  ", ",\n  ".join(select_items), "\nFROM path_0"]
+
         # Add JOINs between CTEs if needed
         if len(pattern_graph['paths']) > 1:
             for i in range(1, len(pattern_graph['paths'])):
@@ -287,15 +282,14 @@ class AdvancedCypherTranspiler:
                         f"path_0.{node}_data.id = path_{i}.{node}_data.id"
                         for node in shared['nodes']
                     ])
-                    from_clause += f"\\nINNER JOIN path_{i} ON {join_condition}"
-        
+                    out.append(f"\nINNER JOIN path_{i} ON {join_condition}")
+
         # Add GROUP BY if there are aggregations
-        group_by_clause = ""
-        if any('COUNT' in item.upper() or 'SUM' in item.upper() for item in select_items):
-            if group_by_items:
-                group_by_clause = f"\\nGROUP BY " + ", ".join(group_by_items)
-        
-        return select_clause + from_clause + group_by_clause
+        if has_aggregate and group_by_items:
+            # hash-based ordered dedup; repeated columns group once
+            out.append("\nGROUP BY " + ", ".join(dict.fromkeys(group_by_items)))
+
+        return "".join(out)
     
     def _parse_properties(self, prop_str: str) -> Dict[str, Any]:
         """Parse property string into dictionary"""
@@ -316,5 +310,5 @@ class AdvancedCypherTranspiler:
             'num_nodes': len(pattern_graph['nodes']),
             'num_edges': len(pattern_graph['edges']),
             'num_paths': len(pattern_graph['paths']),
-            'max_path_length': max([len(p['edges']) for p in pattern_graph['paths']]) if pattern_graph['paths'] else 0
+            'max_path_length': max((len(p['edges']) for p in pattern_graph['paths']), default=0)
         }
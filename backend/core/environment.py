@@ -1262,20 +1262,28 @@ class Environment:
                 self.counterexample += self.sql_code['sql2'] + '\n'
 
                 if self.to_cypher:
+                    graph = self.kwargs['graph']
+                    edge_schema = graph['schema']['edge']
+                    links = graph['links']
                     for e_label, edge in edges.items():
+                        # hoist per-label schema/link lookups out of the
+                        # per-edge-instance loop (tuple keys re-hash each time)
+                        schema_edge = edge_schema[e_label]
+                        src_n = schema_edge['SRC']
+                        direction = "->"
+                        dst_n = schema_edge['TGT']
+                        # src_n, direction, dst_n = schema_edge['direction']
+                        src_n_attr, e_src_attr = links[(src_n, e_label)][direction]
+                        e_dst_attr, dst_n_attr = links[(e_label, dst_n)][direction]
+                        nodes_src = nodes[src_n]
+                        nodes_dst = nodes[dst_n]
                         for e_name, e_info, e_info_str in edge:
-                            src_n = self.kwargs['graph']['schema']['edge'][e_label]['SRC']
-                            direction = "->"
-                            dst_n = self.kwargs['graph']['schema']['edge'][e_label]['TGT']
-                            # src_n, direction, dst_n = self.kwargs['graph']['schema']['edge'][e_label]['direction']
-                            src_n_attr, e_src_attr = self.kwargs['graph']['links'][(src_n, e_label)][direction]
                             src_names = []
-                            for n_name, n_info, _ in nodes[src_n]:
+                            for n_name, n_info, _ in nodes_src:
                                 if e_info[e_src_attr] == n_info[src_n_attr]:
                                     src_names.append(n_name)
-                            e_dst_attr, dst_n_attr = self.kwargs['graph']['links'][(e_label, dst_n)][direction]
                             dst_names = []
-                            for n_name, n_info, _ in nodes[dst_n]:
+                            for n_name, n_info, _ in nodes_dst:
                                 if e_info[e_dst_attr] == n_info[dst_n_attr]:
                                     dst_names.append(n_name)
                             if direction == '->':
@@ -3,6 +3,84 @@ from enum import Enum
 from dataclasses import dataclass
 from typing import List, Dict, Any, Optional, Tuple
 
+# single scan for aggregation calls; the \( guard avoids false positives
+# like `account_count` matching COUNT
+_AGG_RE = re.compile(r'\b(COUNT|SUM|AVG|MAX|MIN)\s*\(', re.IGNORECASE)
+
+# one pass over the query locates every clause keyword; the clause bodies
+# are then sliced out between consecutive keyword offsets
+_CLAUSE_RE = re.compile(r'\b(MATCH|WHERE|WITH|RETURN|ORDER\s+BY|LIMIT)\b', re.IGNORECASE)
+
+# same single-scan treatment for SQL: every clause keyword (including the
+# JOIN variants) found in one pass, bodies sliced between offsets
+_SQL_CLAUSE_RE = re.compile(
+    r'\b(SELECT|FROM|(?:INNER\s+|LEFT\s+(?:OUTER\s+)?|RIGHT\s+(?:OUTER\s+)?|FULL\s+)?JOIN'
+    r'|WHERE|GROUP\s+BY|HAVING|ORDER\s+BY|LIMIT)\b',
+    re.IGNORECASE)
+
+_AND_RE = re.compile(r'\band\b', re.IGNORECASE)
+_TOP_OR_RE = re.compile(r'\bor\b', re.IGNORECASE)
+
+
+def has_top_level_or(predicate: str) -> bool:
+    """True if the predicate contains an OR outside parens and quotes"""
+    depth = 0
+    quoted = False
+    pos = 0
+    while True:
+        match = _TOP_OR_RE.search(predicate, pos)
+        if match is None:
+            return False
+        for ch in predicate[pos:match.start()]:
+            if ch == "'":
+                quoted = not quoted
+            elif not quoted:
+                if ch == '(':
+                    depth += 1
+                elif ch == ')':
+                    depth -= 1
+        if depth == 0 and not quoted:
+            return True
+        pos = match.end()
+
+
+def split_conjuncts(predicate: str) -> List[str]:
+    """Split a predicate on top-level ANDs in one pass
+
+    Tracks parenthesis depth and quoting so "a = 1 AND (b = 2 OR c = 3)"
+    yields two conjuncts while ANDs nested in parens or strings stay put.
+    AND binds tighter than OR, so a predicate with a top-level OR has no
+    conjuncts to split off -- its ANDs are operands of the OR -- and is
+    returned whole. Works on text of any case.
+    """
+    if has_top_level_or(predicate):
+        return [predicate.strip()]
+
+    conjuncts = []
+    depth = 0
+    quoted = False
+    start = 0
+    pos = 0
+    while True:
+        match = _AND_RE.search(predicate, pos)
+        if match is None:
+            break
+        for ch in predicate[pos:match.start()]:
+            if ch == "'":
+                quoted = not quoted
+            elif not quoted:
+                if ch == '(':
+                    depth += 1
+                elif ch == ')':
+                    depth -= 1
+        if depth == 0 and not quoted:
+            conjuncts.append(predicate[start:match.start()].strip())
+            start = match.end()
+        pos = match.end()
+    conjuncts.append(predicate[start:].strip())
+    return conjuncts
+
+
 class QueryType(Enum):
     CYPHER = "cypher"
     SQL = "sql"
@@ -12,18 +90,15 @@ class ElementType(Enum):
     EDGE = "edge"
     ATTRIBUTE = "attribute"
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Node:
-    """Represents a Cypher node pattern"""
+    """Represents a Cypher node pattern; immutable and hashable so nodes
+    can key caches directly"""
     name: str
     label: str
-    properties: Dict[str, Any] = None
-    
-    def __post_init__(self):
-        if self.properties is None:
-            self.properties = {}
+    properties: Tuple[Tuple[str, Any], ...] = ()
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Edge:
     """Represents a Cypher edge pattern"""
     name: str
@@ -31,31 +106,41 @@ class Edge:
     direction: str  # '->', '<-', or '<->'
     source: str
     target: str
-    properties: Dict[str, Any] = None
-    
-    def __post_init__(self):
-        if self.properties is None:
-            self.properties = {}
+    properties: Tuple[Tuple[str, Any], ...] = ()
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PathPattern:
     """Represents a complete path pattern in Cypher"""
-    nodes: List[Node]
-    edges: List[Edge]
+    nodes: Tuple[Node, ...]
+    edges: Tuple[Edge, ...]
 
 class CypherParser:
     """Parses Cypher queries into structured format"""
     
+    _CACHE_SIZE = 1024
+
     def __init__(self):
-        self.node_pattern = r'\((\w+)(?::(\w+))?\s*(?:\{([^}]+)\})?\)'
-        self.edge_pattern = r'-\[(\w+)?(?::(\w+))?(?:\{([^}]+)\})?\]-([>|<]*)-'
-        self.match_clause = r'MATCH\s+(.+?)\s+(?:WHERE|WITH|RETURN)'
-        self.return_clause = r'RETURN\s+(.+?)(?:\s+(?:ORDER\s+BY|LIMIT|$))'
-        self.where_clause = r'WHERE\s+(.+?)(?:\s+(?:WITH|RETURN|ORDER\s+BY|$))'
-        
+        # node and edge patterns fused into one alternation, compiled once;
+        # _parse_match dispatches on lastgroup so a MATCH body is tokenized
+        # in a single finditer pass instead of one scan per pattern
+        self.pattern = re.compile(
+            r'(?P<node>\((?P<nname>\w+)(?::(?P<nlabel>\w+))?\s*(?:\{(?P<nprops>[^}]+)\})?\))'
+            r'|(?P<edge>-\[(?P<ename>\w+)?(?::(?P<elabel>\w+))?(?:\{(?P<eprops>[^}]+)\})?\]-(?P<edir>[>|<]*)-)')
+        # parse results keyed by stripped query text; batch verification
+        # re-parses the same queries repeatedly
+        self._parse_cache: Dict[str, Dict[str, Any]] = {}
+
     def parse(self, query: str) -> Dict[str, Any]:
-        """Parse a Cypher query"""
+        """Parse a Cypher query
+
+        Results are cached per query text; cache hits return a shallow
+        copy, so callers must not mutate the nested clause structures.
+        """
         query = query.strip()
+        cached = self._parse_cache.get(query)
+        if cached is not None:
+            return dict(cached)
+
         result = {
             'type': QueryType.CYPHER,
             'original': query,
@@ -65,65 +150,76 @@ class CypherParser:
             'order_by': None,
             'with_clause': None
         }
-        
-        # Extract MATCH clauses
-        match_clauses = re.findall(r'MATCH\s+([^W\n]+?)(?=\s+(?:WHERE|WITH|RETURN))', 
-                                   query, re.IGNORECASE)
-        for match in match_clauses:
-            result['match_clauses'].append(self._parse_match(match))
-        
-        # Extract WHERE clause
-        where_match = re.search(self.where_clause, query, re.IGNORECASE)
-        if where_match:
-            result['where'] = where_match.group(1).strip()
-        
-        # Extract RETURN clause
-        return_match = re.search(self.return_clause, query, re.IGNORECASE)
-        if return_match:
-            result['return_clause'] = self._parse_return(return_match.group(1))
-        
-        # Extract ORDER BY
-        order_match = re.search(r'ORDER\s+BY\s+(.+?)(?:\s+(?:LIMIT|$))', query, re.IGNORECASE)
-        if order_match:
-            result['order_by'] = order_match.group(1).strip()
-        
-        # Extract WITH clause
-        with_match = re.search(r'WITH\s+(.+?)(?=\s+(?:MATCH|RETURN))', query, re.IGNORECASE)
-        if with_match:
-            result['with_clause'] = with_match.group(1).strip()
-        
-        return result
-    
+
+        # Locate all clause keywords in one scan instead of re-searching the
+        # query once per clause; each clause body runs up to the next keyword
+        marks = list(_CLAUSE_RE.finditer(query))
+        handlers = self._CLAUSE_HANDLERS
+        for i, mark in enumerate(marks):
+            keyword = mark.group(1).split()[0].upper()
+            end = marks[i + 1].start() if i + 1 < len(marks) else len(query)
+            body = query[mark.end():end].strip()
+
+            handler = handlers.get(keyword)
+            if handler is not None:
+                handler(self, result, body)
+
+        if len(self._parse_cache) >= self._CACHE_SIZE:
+            self._parse_cache.clear()
+        self._parse_cache[query] = result
+        return dict(result)
+
+    def _on_match(self, result: Dict[str, Any], body: str) -> None:
+        result['match_clauses'].append(self._parse_match(body))
+
+    def _on_where(self, result: Dict[str, Any], body: str) -> None:
+        if result['where'] is None:
+            result['where'] = body
+
+    def _on_return(self, result: Dict[str, Any], body: str) -> None:
+        result['return_clause'] = self._parse_return(body)
+
+    def _on_order(self, result: Dict[str, Any], body: str) -> None:
+        result['order_by'] = body
+
+    def _on_with(self, result: Dict[str, Any], body: str) -> None:
+        if result['with_clause'] is None:
+            result['with_clause'] = body
+
+    # keyword -> handler; a dict lookup per clause instead of walking an
+    # if/elif chain (LIMIT is recognized by _CLAUSE_RE but has no handler,
+    # matching the previous behavior)
+    _CLAUSE_HANDLERS = {
+        'MATCH': _on_match,
+        'WHERE': _on_where,
+        'RETURN': _on_return,
+        'ORDER': _on_order,
+        'WITH': _on_with,
+    }
+
     def _parse_match(self, match_str: str) -> Dict[str, Any]:
         """Parse a single MATCH clause"""
         nodes = []
         edges = []
-        
-        # Find all nodes
-        for node_match in re.finditer(self.node_pattern, match_str):
-            name = node_match.group(1)
-            label = node_match.group(2) or ""
-            props = node_match.group(3) or ""
-            nodes.append({
-                'name': name,
-                'label': label,
-                'properties': self._parse_properties(props)
-            })
-        
-        # Find all edges
-        for edge_match in re.finditer(self.edge_pattern, match_str):
-            name = edge_match.group(1) or f"e{len(edges)}"
-            label = edge_match.group(2) or ""
-            props = edge_match.group(3) or ""
-            direction = edge_match.group(4)
-            
-            edges.append({
-                'name': name,
-                'label': label,
-                'direction': direction if direction else '->',
-                'properties': self._parse_properties(props)
-            })
-        
+
+        # One pass over the pattern; the alternation branch tells node and
+        # edge matches apart
+        for match in self.pattern.finditer(match_str):
+            if match.group('node') is not None:
+                nodes.append({
+                    'name': match.group('nname'),
+                    'label': match.group('nlabel') or "",
+                    'properties': self._parse_properties(match.group('nprops') or "")
+                })
+            else:
+                direction = match.group('edir')
+                edges.append({
+                    'name': match.group('ename') or f"e{len(edges)}",
+                    'label': match.group('elabel') or "",
+                    'direction': direction if direction else '->',
+                    'properties': self._parse_properties(match.group('eprops') or "")
+                })
+
         return {
             'nodes': nodes,
             'edges': edges,
@@ -137,16 +233,13 @@ class CypherParser:
         
         for item in items:
             # Check for aggregation functions
-            if 'COUNT' in item.upper():
-                return_items.append({'type': 'aggregation', 'function': 'COUNT', 'expression': item})
-            elif 'SUM' in item.upper():
-                return_items.append({'type': 'aggregation', 'function': 'SUM', 'expression': item})
-            elif 'AVG' in item.upper():
-                return_items.append({'type': 'aggregation', 'function': 'AVG', 'expression': item})
-            elif 'MAX' in item.upper():
-                return_items.append({'type': 'aggregation', 'function': 'MAX', 'expression': item})
-            elif 'MIN' in item.upper():
-                return_items.append({'type': 'aggregation', 'function': 'MIN', 'expression': item})
+            agg_match = _AGG_RE.search(item)
+            if agg_match:
+                return_items.append({
+                    'type': 'aggregation',
+                    'function': agg_match.group(1).upper(),
+                    'expression': item
+                })
             else:
                 return_items.append({'type': 'projection', 'expression': item})
         
@@ -168,16 +261,25 @@ class CypherParser:
 
 class SQLParser:
     """Parses SQL queries into structured format"""
-    
-    def __init__(self):
-        self.select_pattern = r'SELECT\s+(.+?)\s+FROM'
-        self.from_pattern = r'FROM\s+(.+?)(?:\s+(?:WHERE|GROUP|ORDER|$))'
-        self.join_pattern = r'(?:INNER\s+|LEFT\s+|RIGHT\s+|FULL\s+)?JOIN\s+(\w+)'
-        self.where_pattern = r'WHERE\s+(.+?)(?:\s+(?:GROUP|ORDER|$))'
-        self.group_pattern = r'GROUP\s+BY\s+(.+?)(?:\s+(?:HAVING|ORDER|$))'
-        
+
+    # clauses whose body lands directly in a result key; FROM and the
+    # JOIN variants get special handling in parse()
+    _CLAUSE_KEYS = {
+        'SELECT': 'select',
+        'WHERE': 'where',
+        'GROUP': 'group_by',
+        'HAVING': 'having',
+        'ORDER': 'order_by',
+    }
+    _JOIN_KEYWORDS = frozenset({'JOIN', 'INNER', 'LEFT', 'RIGHT', 'FULL'})
+
     def parse(self, query: str) -> Dict[str, Any]:
-        """Parse a SQL query"""
+        """Parse a SQL query
+
+        Clause keywords are located in one scan and each clause body is
+        sliced out between consecutive keyword offsets, instead of running
+        a separate bounded regex search per clause.
+        """
         query = query.strip()
         result = {
             'type': QueryType.SQL,
@@ -190,35 +292,20 @@ class SQLParser:
             'having': None,
             'order_by': None
         }
-        
-        # Extract SELECT clause
-        select_match = re.search(self.select_pattern, query, re.IGNORECASE)
-        if select_match:
-            result['select'] = select_match.group(1).strip()
-        
-        # Extract FROM clause
-        from_match = re.search(self.from_pattern, query, re.IGNORECASE)
-        if from_match:
-            from_part = from_match.group(1).strip()
-            result['from'] = from_part.split()
-        
-        # Extract JOINs
-        for join_match in re.finditer(self.join_pattern, query, re.IGNORECASE):
-            result['joins'].append(join_match.group(1))
-        
-        # Extract WHERE clause
-        where_match = re.search(self.where_pattern, query, re.IGNORECASE)
-        if where_match:
-            result['where'] = where_match.group(1).strip()
-        
-        # Extract GROUP BY
-        group_match = re.search(self.group_pattern, query, re.IGNORECASE)
-        if group_match:
-            result['group_by'] = group_match.group(1).strip()
-        
-        # Extract ORDER BY
-        order_match = re.search(r'ORDER\s+BY\s+(.+?)(?:\s+(?:LIMIT|$))', query, re.IGNORECASE)
-        if order_match:
-            result['order_by'] = order_match.group(1).strip()
-        
+
+        marks = list(_SQL_CLAUSE_RE.finditer(query))
+        clause_keys = self._CLAUSE_KEYS
+        for i, mark in enumerate(marks):
+            keyword = mark.group(1).split()[0].upper()
+            end = marks[i + 1].start() if i + 1 < len(marks) else len(query)
+            body = query[mark.end():end].strip()
+
+            key = clause_keys.get(keyword)
+            if key is not None:
+                result[key] = body
+            elif keyword == 'FROM':
+                result['from'] = body.split()
+            elif keyword in self._JOIN_KEYWORDS and body:
+                result['joins'].append(body.split()[0])
+
         return result
@@ -1,26 +1,56 @@
 # backend/core/transformer_engine.py
 
-from typing import Dict, List, Any, Optional, Set, Tuple
-from dataclasses import dataclass
-import re
+from typing import Dict, List, Any, NamedTuple, Optional, Set, Tuple
 
-@dataclass
-class TransformationRule:
-    """Represents a database transformation rule"""
+from core.query_parser import has_top_level_or, split_conjuncts
+
+class TransformationRule(NamedTuple):
+    """Represents a database transformation rule
+
+    A NamedTuple rather than a dataclass: rules are allocated in bulk
+    during SDT construction and never mutated, and tuple.__new__ is
+    cheaper than a generated __init__ assigning each field.
+    """
     source_predicates: List[str]
     target_predicate: str
     condition: Optional[str] = None
-    
+
+
 class DatabaseTransformer:
     """Manages graph-to-relational database transformations"""
     
     def __init__(self):
         self.rules: List[TransformationRule] = []
         self.inverse_rules: List[TransformationRule] = []
-        
+        # SDTs keyed by a schema-derived tuple; schemas are fixed after
+        # load, so the rule construction loops run once per schema
+        self._sdt_cache: Dict[tuple, 'DatabaseTransformer'] = {}
+
+    @staticmethod
+    def _schema_key(graph_schema: Dict[str, Any]) -> tuple:
+        """Hashable cache key covering everything the SDT rules depend on"""
+        nodes = tuple(
+            (label, tuple(definition.get('properties', {})))
+            for label, definition in graph_schema.get('nodes', {}).items())
+        edges = tuple(
+            (label, definition.get('source_node', 'Node'),
+             definition.get('target_node', 'Node'),
+             tuple(definition.get('properties', {})))
+            for label, definition in graph_schema.get('edges', {}).items())
+        return nodes, edges
+
     def create_standard_transformer(self, graph_schema: Dict[str, Any]) -> 'DatabaseTransformer':
-        """Create Standard Database Transformer (SDT) from graph schema"""
-        
+        """Create Standard Database Transformer (SDT) from graph schema
+
+        Memoized per schema key; callers share the returned transformer
+        and must not mutate its rule lists.
+        """
+
+        key = self._schema_key(graph_schema)
+        cached = self._sdt_cache.get(key)
+        if cached is not None:
+            return cached
+
         transformer = DatabaseTransformer()
         
         # Transform nodes
@@ -34,14 +64,17 @@ class DatabaseTransformer:
             for edge_label, edge_def in graph_schema['edges'].items():
                 rule = self._create_edge_transformation_rule(edge_label, edge_def)
                 transformer.rules.append(rule)
-        
+
+        self._sdt_cache[key] = transformer
         return transformer
     
     def _create_node_transformation_rule(self, label: str, definition: Dict[str, Any]) -> TransformationRule:
         """Create transformation rule for a node type"""
         
         properties = definition.get('properties', {})
-        prop_list = ', '.join([f"{key}" for key in properties.keys()])
+        # keys are already strings; join the dict view directly instead of
+        # building a list of per-key f-strings first
+        prop_list = ', '.join(properties)
         
         source_pred = f"{label}({prop_list})"
         target_pred = f"R_{label}({prop_list})"
@@ -57,7 +90,9 @@ class DatabaseTransformer:
         source_node = definition.get('source_node', 'Node')
         target_node = definition.get('target_node', 'Node')
         properties = definition.get('properties', {})
-        prop_list = ', '.join([f"{key}" for key in properties.keys()])
+        # keys are already strings; join the dict view directly instead of
+        # building a list of per-key f-strings first
+        prop_list = ', '.join(properties)
         
         source_pred = f"{label}({source_node}, {target_node}, {prop_list})"
         target_pred = f"R_{label}({source_node}, {target_node}, {prop_list})"
@@ -98,22 +133,25 @@ class DatabaseTransformer:
         """Compose two transformers (S -> R and R -> R') into S -> R'"""
         
         composed = DatabaseTransformer()
-        
-        # For each rule in transformer1 (S -> R)
+
+        # Index transformer2 rules by source predicate so composition is
+        # O(R1 + R2) instead of scanning all rule pairs
+        index: Dict[str, TransformationRule] = {}
+        for rule2 in transformer2.rules:
+            for source_pred in rule2.source_predicates:
+                index.setdefault(source_pred, rule2)
+
         for rule1 in transformer1.rules:
-            # Find matching rules in transformer2
-            for rule2 in transformer2.rules:
-                if self._rules_compatible(rule1, rule2):
-                    # Create composed rule
-                    composed_rule = self._compose_rules(rule1, rule2)
-                    composed.rules.append(composed_rule)
-        
+            rule2 = index.get(rule1.target_predicate)
+            if rule2 is not None:
+                composed.rules.append(self._compose_rules(rule1, rule2))
+
         return composed
-    
+
     def _rules_compatible(self, rule1: TransformationRule, rule2: TransformationRule) -> bool:
         """Check if two rules can be composed"""
-        # Rules are compatible if output of rule1 matches input of rule2
-        return rule1.target_predicate == rule2.source_predicates
+        # Rules are compatible if output of rule1 matches an input of rule2
+        return rule1.target_predicate in rule2.source_predicates
     
     def _compose_rules(self, rule1: TransformationRule, rule2: TransformationRule) -> TransformationRule:
         """Compose two transformation rules"""
@@ -125,8 +163,14 @@ class DatabaseTransformer:
         )
     
     def _combine_conditions(self, cond1: Optional[str], cond2: Optional[str]) -> Optional[str]:
-        """Combine conditions from two rules"""
-        
+        """Combine conditions from two rules
+
+        AND is associative, so conjunctions are flattened instead of
+        parenthesized: composing a chain of rules yields
+        'a AND b AND c', not '((a AND b) AND c)' with one paren level
+        per composition.
+        """
+
         if not cond1 and not cond2:
             return None
         elif cond1 and not cond2:
@@ -134,4 +178,16 @@ class DatabaseTransformer:
         elif not cond1 and cond2:
             return cond2
         else:
-            return f"({cond1}) AND ({cond2})"
+            return " AND ".join(self._and_operands(cond1) + self._and_operands(cond2))
+
+    @staticmethod
+    def _and_operands(cond: str) -> List[str]:
+        """Top-level AND operands of a condition
+
+        A condition with a top-level OR is wrapped in parentheses and
+        counts as a single operand, preserving precedence; ORs already
+        inside parens or quotes don't block conjunct splitting.
+        """
+        if has_top_level_or(cond):
+            return [f"({cond})"]
+        return split_conjuncts(cond)
@@ -1,6 +1,52 @@
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Sequence, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import io
+import os
 import re
-from core.query_parser import CypherParser, SQLParser
+from core.query_parser import CypherParser, SQLParser, has_top_level_or, split_conjuncts
+
+# aliases referenced by a predicate, e.g. 'a.age > 30' -> {'a'}
+_ALIAS_RE = re.compile(r'\b(\w+)\.')
+
+
+# Interned SQL fragments: the same (alias, table, property) combinations
+# recur across MATCH clauses and across queries against one schema, so
+# each fragment string is built once and the cached object reused.
+
+@lru_cache(maxsize=4096)
+def _star(alias: str) -> str:
+    return f"{alias}.*"
+
+
+@lru_cache(maxsize=4096)
+def _join_edge(edge_table: str, src_alias: str) -> str:
+    return f"  JOIN {edge_table} ON {src_alias}.id = {edge_table}.src"
+
+
+@lru_cache(maxsize=4096)
+def _join_node(table: str, alias: str, edge_table: str) -> str:
+    return f"  JOIN {table} AS {alias} ON {edge_table}.tgt = {alias}.id"
+
+
+@lru_cache(maxsize=4096)
+def _prop_eq(alias: str, prop: str, value: Any) -> str:
+    if isinstance(value, str):
+        return f"{alias}.{prop} = '{value}'"
+    return f"{alias}.{prop} = {value}"
+
+
+def _and_join(conjuncts: List[str]) -> str:
+    """AND-join conjuncts, parenthesizing any with a top-level OR
+
+    AND binds tighter than OR, so an unwrapped OR operand would bind
+    its last branch to the neighbouring conjunct instead of the whole
+    disjunction.
+    """
+    return " AND ".join(
+        '(' + conjunct + ')' if has_top_level_or(conjunct) else conjunct
+        for conjunct in conjuncts)
+
 
 class CypherToSQLTranspiler:
     """Transpiles Cypher queries to SQL queries"""
@@ -9,92 +55,242 @@ class CypherToSQLTranspiler:
         self.induced_schema = induced_schema or {}
         self.cypher_parser = CypherParser()
         self.cte_counter = 0
-        
+        # seed the label cache from the induced schema's (lowercase) table
+        # names under the spellings a Cypher label typically uses, so even
+        # the first lookup per label skips str.lower()
+        self._label_cache: Dict[str, str] = {}
+        for name in self.induced_schema.get('tables', {}):
+            self._label_cache[name] = name
+            self._label_cache[name.capitalize()] = name
+            self._label_cache[name.upper()] = name
+        # finished SQL keyed by query text; batch verification transpiles
+        # the same queries repeatedly against one schema
+        self._sql_cache: Dict[str, str] = {}
+        # CTE text keyed by (cte name, raw MATCH text, pushed conjuncts);
+        # the same pattern recurs across different queries and its CTE is
+        # fully determined by these inputs for a fixed schema
+        self._match_cache: Dict[tuple, str] = {}
+
+    _SQL_CACHE_SIZE = 1024
+
+    def _tbl(self, label: str, default: str = "nodes") -> str:
+        """Resolve a node/edge label to its table name, caching lowercased labels"""
+        if not label:
+            return default
+        return self._label_cache.setdefault(label, label.lower())
+
     def transpile(self, cypher_query: str) -> str:
-        """Transpile a Cypher query to SQL"""
+        """Transpile a Cypher query to SQL
+
+        Results are cached per query text, mirroring the parser's cache:
+        the transpiler is deterministic for a fixed schema, so a repeat
+        query is a single dict probe.
+        """
+        cypher_query = cypher_query.strip()
+        cached = self._sql_cache.get(cypher_query)
+        if cached is not None:
+            return cached
+
         parsed = self.cypher_parser.parse(cypher_query)
         
         # Convert any enum values to strings for JSON serialization
         if 'query_type' in parsed and hasattr(parsed['query_type'], 'value'):
             parsed['query_type'] = parsed['query_type'].value
         
-        sql_parts = []
+        # Push WHERE conjuncts that only touch one MATCH clause's aliases
+        # down into that clause's CTE; filtering before the join keeps the
+        # intermediate results small. Conjuncts spanning clauses (or
+        # referencing no alias) stay in the outer query.
+        pushed, residual = self._push_down_where(parsed['where'], parsed['match_clauses'])
+
+        match_clauses = parsed['match_clauses']
+
+        # A single MATCH needs no CTE wrapper: fuse pattern, filters and
+        # RETURN into one flat SELECT instead of 'WITH t1 AS (...) SELECT
+        # ... FROM t1'
+        if len(match_clauses) == 1 and match_clauses[0]['nodes'] and parsed['return_clause']:
+            _, from_line, join_clause, where_clauses = self._match_components(
+                match_clauses[0], pushed.get(0))
+            sql = self._transpile_return(
+                parsed['return_clause'], [],
+                _and_join(where_clauses + residual),
+                from_clause=from_line, join_clause=join_clause)
+            if len(self._sql_cache) >= self._SQL_CACHE_SIZE:
+                self._sql_cache.clear()
+            self._sql_cache[cypher_query] = sql
+            return sql
+
         cte_definitions = []
-        
+
         # Process MATCH clauses
         for i, match in enumerate(parsed['match_clauses']):
             cte_name = f"t{i+1}"
-            cte_sql = self._transpile_match(match, cte_name, i)
+            cte_sql = self._transpile_match(match, cte_name, i, pushed.get(i))
             cte_definitions.append(cte_sql)
-        
-        # Build final query
+
+        # Build final query; a sequential writer avoids the extra pass a
+        # nested join-of-joins makes over every fragment
+        buf = io.StringIO()
         if cte_definitions:
-            with_clause = ",\n".join(cte_definitions)
-            sql_parts.append(f"WITH {with_clause}")
-        
+            buf.write("WITH ")
+            for i, cte in enumerate(cte_definitions):
+                if i:
+                    buf.write(",\n")
+                buf.write(cte)
+
         # Add SELECT/RETURN
         if parsed['return_clause']:
-            select_sql = self._transpile_return(parsed['return_clause'], cte_definitions)
-            sql_parts.append(select_sql)
-        
-        return "\n".join(sql_parts)
-    
-    def _transpile_match(self, match: Dict[str, Any], cte_name: str, index: int) -> str:
-        """Transpile a MATCH clause to SQL CTE"""
+            if cte_definitions:
+                buf.write("\n")
+            buf.write(self._transpile_return(parsed['return_clause'], cte_definitions,
+                                             _and_join(residual)))
+
+        sql = buf.getvalue()
+        if len(self._sql_cache) >= self._SQL_CACHE_SIZE:
+            self._sql_cache.clear()
+        self._sql_cache[cypher_query] = sql
+        return sql
+
+    @staticmethod
+    def _push_down_where(where: str,
+                         match_clauses: List[Dict[str, Any]]) -> Tuple[Dict[int, List[str]], List[str]]:
+        """Assign WHERE conjuncts to the single MATCH clause they filter
+
+        Returns (clause index -> pushable conjuncts, residual conjuncts).
+        """
+        pushed: Dict[int, List[str]] = {}
+        residual: List[str] = []
+        if not where:
+            return pushed, residual
+
+        # With a top-level OR the AND-separated pieces are OR-branch
+        # members, not conjuncts; filtering any single CTE with one of
+        # them would drop rows, so the whole predicate stays outside
+        if has_top_level_or(where):
+            residual.append(where.strip())
+            return pushed, residual
+
+        # Each alias gets one bit; a clause's alias set and a conjunct's
+        # reference set are then single ints, so classification is integer
+        # AND/compare instead of set intersection per clause
+        alias_bits: Dict[str, int] = {}
+        clause_masks: List[int] = []
+        for match in match_clauses:
+            mask = 0
+            for pattern in (match['nodes'], match['edges']):
+                for item in pattern:
+                    name = item['name']
+                    bit = alias_bits.get(name)
+                    if bit is None:
+                        bit = 1 << len(alias_bits)
+                        alias_bits[name] = bit
+                    mask |= bit
+            clause_masks.append(mask)
+
+        for conjunct in split_conjuncts(where):
+            conj_mask = 0
+            unknown = False
+            for ref in _ALIAS_RE.findall(conjunct):
+                bit = alias_bits.get(ref)
+                if bit is None:
+                    unknown = True
+                    break
+                conj_mask |= bit
+            targets = [i for i, mask in enumerate(clause_masks) if conj_mask & mask]
+            if conj_mask and not unknown and len(targets) == 1:
+                pushed.setdefault(targets[0], []).append(conjunct)
+            else:
+                residual.append(conjunct)
+        return pushed, residual
+
+    def _transpile_match(self, match: Dict[str, Any], cte_name: str, index: int,
+                         extra_where: List[str] = None) -> str:
+        """Transpile a MATCH clause to SQL CTE
+
+        Specialized per (cte name, raw pattern, pushed filters): the CTE
+        text is fully determined by those inputs for a fixed schema, so
+        a pattern shared between queries is emitted once.
+        """
+        cache_key = (cte_name, match['raw'], tuple(extra_where) if extra_where else ())
+        cached = self._match_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        if not match['nodes']:
+            return f"{cte_name} AS (SELECT 1 WHERE 0)"
+
+        select_clause, from_line, join_clause, where_clauses = \
+            self._match_components(match, extra_where)
+
+        # collect fragments and join once instead of repeated str
+        # concatenation; plain + beats FORMAT_VALUE bytecode when every
+        # operand is already a string
+        parts = [
+            cte_name + " AS (",
+            "  SELECT " + select_clause,
+            "  FROM " + from_line,
+        ]
+        if join_clause:
+            parts.append(join_clause)
+        if where_clauses:
+            parts.append("  WHERE " + _and_join(where_clauses))
+        parts.append(")")
+
+        cte_sql = "\n".join(parts)
+        if len(self._match_cache) >= self._SQL_CACHE_SIZE:
+            self._match_cache.clear()
+        self._match_cache[cache_key] = cte_sql
+        return cte_sql
+
+    def _match_components(self, match: Dict[str, Any],
+                          extra_where: List[str] = None) -> Tuple[str, str, str, List[str]]:
+        """Build the reusable pieces of a MATCH clause's SELECT
+
+        Returns (select clause, FROM line, join clause, WHERE conjuncts);
+        used both for CTE bodies and for the fused single-MATCH form.
+        """
         nodes = match['nodes']
         edges = match['edges']
-        
-        if not nodes:
-            return f"{cte_name} AS (SELECT 1 WHERE 0)"
-        
+
         # Start with first node/table
         first_node = nodes[0]
-        from_table = first_node['label'].lower() if first_node['label'] else "nodes"
-        
+        from_table = self._tbl(first_node['label'])
+
         # Build joins for edges
         joins = []
         for i, edge in enumerate(edges):
-            edge_table = edge['label'].lower() if edge['label'] else f"edge_{i}"
+            edge_table = self._tbl(edge['label'], default=f"edge_{i}")
             # Simplified join condition
             if i < len(nodes) - 1:
                 next_node = nodes[i + 1]
-                next_table = next_node['label'].lower() if next_node['label'] else "nodes"
-                joins.append(f"  JOIN {edge_table} ON {first_node['name']}.id = {edge_table}.src")
-                joins.append(f"  JOIN {next_table} AS {next_node['name']} ON {edge_table}.tgt = {next_node['name']}.id")
-        
-        join_clause = "\n".join(joins)
-        
+                next_table = self._tbl(next_node['label'])
+                joins.append(_join_edge(edge_table, first_node['name']))
+                joins.append(_join_node(next_table, next_node['name'], edge_table))
+
         # Build SELECT items
-        select_items = [f"{node['name']}.*" for node in nodes]
-        select_clause = ", ".join(select_items)
-        
-        where_clauses = []
-        # Add property filters from nodes
+        select_clause = ", ".join(_star(node['name']) for node in nodes)
+
+        where_clauses = list(extra_where) if extra_where else []
+        # Add property filters from nodes (string values keep their quotes
+        # inside _prop_eq)
         for node in nodes:
             if node.get('properties'):
                 for prop, value in node['properties'].items():
-                    # Handle string values with quotes
-                    if isinstance(value, str):
-                        where_clauses.append(f"{node['name']}.{prop} = '{value}'")
-                    else:
-                        where_clauses.append(f"{node['name']}.{prop} = {value}")
-        
-        sql = f"{cte_name} AS (\n"
-        sql += f"  SELECT {select_clause}\n"
-        sql += f"  FROM {from_table} AS {first_node['name']}\n"
-        if join_clause:
-            sql += join_clause + "\n"
-        if where_clauses:
-            sql += f"  WHERE " + " AND ".join(where_clauses) + "\n"
-        sql += ")"
-        
-        return sql
-        
-    def _transpile_return(self, return_clause: Dict[str, Any], ctes: List[str]) -> str:
-        """Transpile RETURN clause to SELECT"""
+                    where_clauses.append(_prop_eq(node['name'], prop, value))
+
+        return (select_clause, f"{from_table} AS {first_node['name']}",
+                "\n".join(joins), where_clauses)
+
+    def _transpile_return(self, return_clause: Dict[str, Any], ctes: List[str],
+                          where: str = "", from_clause: str = "t1",
+                          join_clause: str = "") -> str:
+        """Transpile RETURN clause to SELECT
+
+        from_clause/join_clause default to reading the first CTE; the
+        fused single-MATCH form passes the pattern's own FROM and joins.
+        """
         items = return_clause['items']
-        from_table = "t1"  # Default to first CTE
-        
+
         select_items = []
         group_by_items = []
         
@@ -102,25 +298,74 @@ class CypherToSQLTranspiler:
             if item['type'] == 'aggregation':
                 select_items.append(item['expression'])
             else:
-                select_items.append(item['expression'])
+                expression = item['expression']
+                select_items.append(expression)
                 # Extract column name for GROUP BY - FIX THIS PART
-                col_parts = item['expression'].split('.')
-                if len(col_parts) > 1:
-                    col = col_parts[-1].split(' ')[0]  # Get the column name
-                    if col != '*':
+                if '.' in expression:
+                    # rpartition/partition return tuples, avoiding the list
+                    # allocations of the previous split() calls
+                    col = expression.rpartition('.')[2].partition(' ')[0]
+                    if col and col != '*':
                         group_by_items.append(col)
         
         select_clause = ",\n    ".join(select_items)
-        
-        sql = f"SELECT {select_clause}\nFROM {from_table}"
-        
+
+        # all-string operands: plain concatenation skips the f-string
+        # formatting bytecode on the hottest emit path
+        sql = "SELECT " + select_clause + "\nFROM " + from_clause
+
+        if join_clause:
+            sql += "\n" + join_clause
+
+        if where:
+            sql += "\nWHERE " + where
+
         if group_by_items:
-            group_clause = ", ".join(group_by_items)  # Changed from ",\n    " to ", "
-            sql += f"\nGROUP BY {group_clause}"
-        
+            # dict.fromkeys dedups in one hash pass while keeping first-seen
+            # order, so RETURN items sharing a column emit one group key
+            sql += "\nGROUP BY " + ", ".join(dict.fromkeys(group_by_items))
+
         return sql
 
 
+# worker-resident transpiler: the schema is pickled once per worker via
+# the pool initializer instead of once per task
+_worker_transpiler = None
+
+
+def _init_worker(schema: Dict[str, Any]) -> None:
+    global _worker_transpiler
+    _worker_transpiler = CypherToSQLTranspiler(schema)
+
+
+def _transpile_one(query: str) -> str:
+    # module-level so ProcessPoolExecutor can pickle it
+    return _worker_transpiler.transpile(query)
+
+
+def transpile_many(queries: Sequence[str], schema: Dict[str, Any] = None,
+                   workers: int = None) -> List[str]:
+    """Transpile a batch of Cypher queries across worker processes
+
+    Transpilation is pure and deterministic per query, so corpus-scale
+    batches scale near-linearly over a process pool (threads would
+    serialize on the GIL); results come back in input order.
+    """
+    queries = list(queries)
+    if not queries:
+        return []
+
+    workers = min(workers or os.cpu_count() or 1, len(queries))
+    if workers <= 1:
+        transpiler = CypherToSQLTranspiler(schema)
+        return [transpiler.transpile(query) for query in queries]
+
+    chunksize = max(1, len(queries) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(schema,)) as executor:
+        return list(executor.map(_transpile_one, queries, chunksize=chunksize))
+
+
 class SchemaMapper:
     """Maps between graph schemas and induced relational schemas"""
     
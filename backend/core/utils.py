@@ -1,9 +1,8 @@
 # -*- coding: utf-8 -*-
 
-import ctypes
 import datetime
-import functools
 import math
+import mmap
 import os
 import re
 import time
@@ -11,6 +10,13 @@ import uuid
 
 import ujson
 
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # numba/numpy are optional accelerators
+    np = None
+    njit = None
+
 from constants import (
     If,
     Or,
@@ -29,11 +35,25 @@ def is_uninterpreted_func(func):
 
 
 def _MAX(*args):
-    return functools.reduce(lambda x, y: If(x >= y, x, y), args)
+    # pairwise reduction keeps the If-tree depth at log2(N) instead of N,
+    # which is cheaper for Z3 to traverse and simplify
+    xs = list(args)
+    while len(xs) > 1:
+        paired = [If(x >= y, x, y) for x, y in zip(xs[0::2], xs[1::2])]
+        if len(xs) % 2:
+            paired.append(xs[-1])
+        xs = paired
+    return xs[0]
 
 
 def _MIN(*args):
-    return functools.reduce(lambda x, y: If(x < y, x, y), args)
+    xs = list(args)
+    while len(xs) > 1:
+        paired = [If(x < y, x, y) for x, y in zip(xs[0::2], xs[1::2])]
+        if len(xs) % 2:
+            paired.append(xs[-1])
+        xs = paired
+    return xs[0]
 
 
 encode_same = lambda null1, null2, value1, value2: \
@@ -51,10 +71,22 @@ encode_is_distinct_from = lambda null1, null2, value1, value2: \
 encode_is_not_distinct_from = lambda null1, null2, value1, value2: \
     Or(Not(Or(value1 != value2, null1, null2)), And(null1, null2))
 
-faster_func = lambda xs: int(xs[0] < xs[1])
-slower_1x1_func = lambda xs: int(xs[1] < xs[0] <= 1.1 * xs[1])
-slower_1x2_func = lambda xs: int(1.1 * xs[1] < xs[0] <= 1.2 * xs[1])
-slower_1x2_more_func = lambda xs: int(1.2 * xs[1] < xs[0])
+# hot comparison helpers: plain two-argument defs avoid the per-call
+# indexing of the previous `lambda xs: ...` form (bool is an int subclass)
+def faster_func(a, b):
+    return a < b
+
+
+def slower_1x1_func(a, b):
+    return b < a <= 1.1 * b
+
+
+def slower_1x2_func(a, b):
+    return 1.1 * b < a <= 1.2 * b
+
+
+def slower_1x2_more_func(a, b):
+    return 1.2 * b < a
 
 
 def simplify(formulas, operator, add_not: bool = False):
@@ -84,45 +116,68 @@ def read_schema_file(file):
             if str.upper(pair['Name']) == name:
                 return pair['Type']
 
+    def _key_name(keywords):
+        return str.upper(keywords.get('Name', keywords.get('FName', None)))
+
+    def _scan(keys, table_schema):
+        for keywords in keys:
+            table_schema[_key_name(keywords)] = str.upper(keywords.get('Type', None))
+
     schema = {}
     constraints = []
-    with open(file, 'r') as reader:
+    # bytes-mode read: ujson.loads accepts bytes directly, skipping the
+    # text-mode UTF-8 decode pass over the whole file
+    with open(file, 'rb') as reader:
         database = ujson.loads(reader.read())
-        for db in database['Tables']:
-            db['TableName'] = str.upper(db['TableName'])
-            schema[db['TableName']] = {}
+        tables = database['Tables']
+        _upper_names = [str.upper(table['TableName']) for table in tables]
+        for db, db_name in zip(tables, _upper_names):
+            db['TableName'] = db_name
+            table_schema = schema.setdefault(db_name, {})
             if len(db['PKeys']) > 0:
-                for keywords in db['PKeys']:
-                    name = str.upper(keywords.get('Name', keywords.get('FName', None)))
-                    schema[db['TableName']][name] = str.upper(keywords.get('Type', None))
-                pkeys = [f"{db['TableName']}__{key}" for key in schema[db['TableName']].keys()]
+                _scan(db['PKeys'], table_schema)
+                pkeys = [f"{db_name}__{key}" for key in table_schema.keys()]
                 constraints.append({'primary': [{'value': key} for key in pkeys]})
             if len(db['FKeys']) > 0:
                 for keywords in db['FKeys']:
-                    name = str.upper(keywords.get('Name', keywords.get('FName', None)))
-                    foreign_table = database['Tables'][int(keywords['PTable'])]
-                    foreign_table['TableName'] = str.upper(foreign_table['TableName'])
+                    name = _key_name(keywords)
+                    foreign_idx = int(keywords['PTable'])
+                    foreign_table = tables[foreign_idx]
+                    foreign_table['TableName'] = _upper_names[foreign_idx]
                     constraints.append(
                         {'foreign': [
-                            {'value': f"{db['TableName']}__{name}"},
-                            {'value': f"{foreign_table['TableName']}__{str.upper(keywords['PName'])}"},
+                            {'value': f"{db_name}__{name}"},
+                            {'value': f"{_upper_names[foreign_idx]}__{str.upper(keywords['PName'])}"},
                         ]})
-                    schema[db['TableName']][name] = _foreign_key_type(name, foreign_table)
+                    table_schema[name] = _foreign_key_type(name, foreign_table)
             if len(db['Others']) > 0:
-                for keywords in db['Others']:
-                    name = str.upper(keywords.get('Name', keywords.get('FName', None)))
-                    schema[db['TableName']][name] = str.upper(keywords.get('Type', None))
+                _scan(db['Others'], table_schema)
     return schema, constraints
 
 
 def dedup_constraints(constraints):
     if len(constraints) == 0:
         return None
+    # bucket by hash so each constraint is only compared against the few
+    # candidates sharing its hash, not the whole output list (O(n) vs O(n^2));
+    # Z3 AstRefs hash/compare structurally, so semantics are unchanged
     outs = []
-    for cons in constraints:
-        if cons not in outs:
-            outs.append(cons)
-    return outs
+    buckets = {}
+    try:
+        for cons in constraints:
+            bucket = buckets.setdefault(hash(cons), [])
+            if cons not in bucket:
+                bucket.append(cons)
+                outs.append(cons)
+        return outs
+    except TypeError:
+        # unhashable constraints (e.g. the dict-shaped entries
+        # read_schema_file builds): keep the linear equality scan
+        outs = []
+        for cons in constraints:
+            if cons not in outs:
+                outs.append(cons)
+        return outs
 
 
 def _line_num(reader):
@@ -148,14 +203,18 @@ def safe_readline(f):
 
 
 def find_offsets(filename, num_chunks):
-    with open(filename, "r", encoding="utf-8") as f:
+    with open(filename, "rb") as f:
         size = os.fstat(f.fileno()).st_size
         chunk_size = size // num_chunks
         offsets = [0 for _ in range(num_chunks + 1)]
-        for i in range(1, num_chunks):
-            f.seek(chunk_size * i)
-            safe_readline(f)
-            offsets[i] = f.tell()
+        if size == 0:
+            return offsets
+        # scan for newlines at byte level; avoids the UnicodeDecodeError
+        # retry loop of safe_readline on misaligned UTF-8 positions
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for i in range(1, num_chunks):
+                newline = mm.find(b'\n', chunk_size * i)
+                offsets[i] = newline + 1 if newline != -1 else size
         return offsets
 
 
@@ -209,15 +268,53 @@ def strptime_to_int(date: str):
     return interval.days + 1  # avoid bool('1970-01-01') == 0
 
 
+# Julian day number of MIN_DATE (1970-01-01)
+_MIN_JDN = 2440588
+
+if njit is not None:
+    @njit(cache=True)
+    def _dates_to_int(buf, stride, n, min_jdn):
+        # buf holds n ASCII 'YYYY-MM-DD' strings packed back to back;
+        # numba's string support is limited, so parse the raw bytes
+        out = np.empty(n, np.int64)
+        for i in range(n):
+            base = i * stride
+            y = (buf[base] - 48) * 1000 + (buf[base + 1] - 48) * 100 + \
+                (buf[base + 2] - 48) * 10 + (buf[base + 3] - 48)
+            m = (buf[base + 5] - 48) * 10 + buf[base + 6] - 48
+            d = (buf[base + 8] - 48) * 10 + buf[base + 9] - 48
+            a = (14 - m) // 12
+            yy = y + 4800 - a
+            mm = m + 12 * a - 3
+            jdn = d + (153 * mm + 2) // 5 + 365 * yy + yy // 4 - yy // 100 + yy // 400 - 32045
+            out[i] = jdn - min_jdn + 1  # avoid bool('1970-01-01') == 0
+        return out
+
+
+def strptime_batch_to_int(dates):
+    # batch variant of strptime_to_int; the numba kernel parses packed ASCII
+    # bytes, falling back to the scalar path when the accelerators are absent
+    # or the dates are not uniform 'YYYY-MM-DD' strings
+    if njit is not None and all(len(date) == 10 for date in dates):
+        buf = np.frombuffer(''.join(dates).encode('ascii'), dtype=np.uint8)
+        return _dates_to_int(buf, 10, len(dates), _MIN_JDN).tolist()
+    return [strptime_to_int(date) for date in dates]
+
+
 def int_to_strptime(date: int):
     date = MIN_DATE + datetime.timedelta(days=date - 1)
     return str(date)[:10]
 
 
+# same wrap-around as ctypes.c_size_t on 64-bit builds, without the
+# per-call C object allocation
+_HASH_MASK = (1 << 64) - 1
+
+
 def __pos_hash__(var):
     if isinstance(var, str):
         # positive hash code
-        return ctypes.c_size_t(hash(var)).value
+        return hash(var) & _HASH_MASK
     else:
         return hash(var)
 
@@ -232,7 +329,7 @@ def sort_key(file):
 def merge_dicts(dicts):
     out = {}
     for d in dicts:
-        out.update(d)
+        out |= d  # C-level dict.__ior__ fast path
     return out
 
 
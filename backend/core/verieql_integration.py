@@ -1,23 +1,111 @@
 # backend/core/verieql_integration.py
 
+import contextlib
 import re
 import subprocess
 import json
 import tempfile
+import threading
 import os
 from typing import Dict, Any, Optional, Tuple
 
+class VeriEQLPool:
+    """Persistent VeriEQL worker process for bulk verification
+
+    One-shot `subprocess.run` pays fork+exec plus solver warm-up on every
+    check, which dominates batch workloads. The pool launches VeriEQL
+    once in `--server` mode and exchanges newline-delimited JSON over its
+    pipes, amortizing the startup cost across all queries. When the
+    executable predates `--server` the pool transparently degrades to a
+    one-shot VeriEQLVerifier per call.
+    """
+
+    def __init__(self, verieql_path: str = None):
+        self._fallback = VeriEQLVerifier(verieql_path)
+        self.verieql_path = self._fallback.verieql_path
+        self._lock = threading.Lock()
+        self.proc = None
+        self._server_supported = self._probe_server_mode()
+        if self._server_supported:
+            self._start()
+
+    def verify(self, sql1: str, sql2: str, bound: int = 20, timeout: int = 600) -> Dict[str, Any]:
+        """Verify SQL equivalence, reusing the resident worker when possible"""
+        if not self._server_supported:
+            return self._fallback.verify(sql1, sql2, bound, timeout)
+
+        request = json.dumps({'sql1': sql1, 'sql2': sql2, 'bound': bound, 'timeout': timeout})
+        with self._lock:
+            try:
+                line = self._roundtrip(request)
+            except (OSError, ValueError):
+                # worker died mid-request; restart once and retry
+                self._start()
+                try:
+                    line = self._roundtrip(request)
+                except (OSError, ValueError):
+                    self._server_supported = False
+                    return self._fallback.verify(sql1, sql2, bound, timeout)
+        return json.loads(line)
+
+    def close(self):
+        """Terminate the resident worker, if any"""
+        with self._lock:
+            if self.proc is not None:
+                with contextlib.suppress(OSError):
+                    self.proc.stdin.close()
+                self.proc.terminate()
+                self.proc.wait()
+                self.proc = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _probe_server_mode(self) -> bool:
+        try:
+            probe = subprocess.run(
+                [self.verieql_path, '--help'],
+                capture_output=True, text=True, timeout=10
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+        return '--server' in (probe.stdout + probe.stderr)
+
+    def _start(self):
+        if self.proc is not None:
+            self.proc.kill()
+            self.proc.wait()
+        self.proc = subprocess.Popen(
+            [self.verieql_path, '--server'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            text=True, bufsize=1
+        )
+
+    def _roundtrip(self, request: str) -> str:
+        self.proc.stdin.write(request + '\n')
+        self.proc.stdin.flush()
+        line = self.proc.stdout.readline()
+        if not line:
+            raise ValueError('VeriEQL server closed its pipe')
+        return line
+
+
 class VeriEQLVerifier:
     """Interface to VeriEQL bounded equivalence checker"""
-    
+
     def __init__(self, verieql_path: str = None):
         self.verieql_path = verieql_path or self._find_verieql()
-        self.temp_dir = tempfile.gettempdir()
-        
+        # /dev/shm keeps the fallback temp files off disk on Linux
+        self.temp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+        self._supports_stdin = None  # unknown until first verify
+
     def verify(self, sql1: str, sql2: str, bound: int = 20, timeout: int = 600) -> Dict[str, Any]:
         """
         Verify SQL equivalence using VeriEQL
-        
+
         Returns:
             {
                 'result': 'equivalent' | 'not_equivalent' | 'unknown',
@@ -26,29 +114,76 @@ class VeriEQLVerifier:
                 'counterexample': Optional[str]
             }
         """
-        
-        # Create temporary files for SQL queries
-        sql1_file = os.path.join(self.temp_dir, f'query1_{id(sql1)}.sql')
-        sql2_file = os.path.join(self.temp_dir, f'query2_{id(sql2)}.sql')
-        
+
+        # Prefer streaming both queries over stdin: no temp files, no
+        # filesystem round-trip per verification
+        if self._supports_stdin is not False:
+            result = self._run_verieql_stdin(sql1, sql2, bound, timeout)
+            if result is not None:
+                return result
+
+        # Fallback: temporary files; NamedTemporaryFile picks collision-free
+        # names and the suppress()ed unlink skips the exists/remove stat
+        # pair while still guaranteeing cleanup on any exception
+        with tempfile.NamedTemporaryFile('w', suffix='.sql', dir=self.temp_dir, delete=False) as f1, \
+                tempfile.NamedTemporaryFile('w', suffix='.sql', dir=self.temp_dir, delete=False) as f2:
+            f1.write(sql1)
+            f2.write(sql2)
+
         try:
-            # Write queries to files
-            with open(sql1_file, 'w') as f:
-                f.write(sql1)
-            with open(sql2_file, 'w') as f:
-                f.write(sql2)
-            
-            # Call VeriEQL
-            result = self._run_verieql(sql1_file, sql2_file, bound, timeout)
-            
-            return result
-            
+            return self._run_verieql(f1.name, f2.name, bound, timeout)
         finally:
-            # Cleanup
-            if os.path.exists(sql1_file):
-                os.remove(sql1_file)
-            if os.path.exists(sql2_file):
-                os.remove(sql2_file)
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(f1.name)
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(f2.name)
+
+    def _run_verieql_stdin(self, sql1: str, sql2: str, bound: int, timeout: int) -> Optional[Dict[str, Any]]:
+        """Run VeriEQL with both queries piped via stdin
+
+        Returns None (and remembers the failure) when the executable does
+        not support the --stdin flag, so verify() falls back to temp files.
+        """
+
+        import time
+        start_time = time.time()
+
+        try:
+            cmd = [
+                self.verieql_path,
+                '--stdin',
+                '--bound', str(bound),
+                '--timeout', str(timeout)
+            ]
+
+            result = subprocess.run(
+                cmd,
+                input=f'---QUERY1---\n{sql1}\n---QUERY2---\n{sql2}\n',
+                capture_output=True,
+                text=True,
+                timeout=timeout + 10
+            )
+
+            if result.returncode != 0 and not result.stdout:
+                # unknown flag or refused input; don't try stdin again
+                self._supports_stdin = False
+                return None
+
+            self._supports_stdin = True
+            elapsed = (time.time() - start_time) * 1000
+            return self._parse_verieql_output(result.stdout, result.stderr, elapsed)
+
+        except subprocess.TimeoutExpired:
+            self._supports_stdin = True
+            return {
+                'result': 'timeout',
+                'bound': bound,
+                'time_ms': (time.time() - start_time) * 1000,
+                'counterexample': None
+            }
+        except OSError:
+            self._supports_stdin = False
+            return None
     
     def _run_verieql(self, sql1_file: str, sql2_file: str, bound: int, timeout: int) -> Dict[str, Any]:
         """Execute VeriEQL verification"""
@@ -101,10 +236,11 @@ class VeriEQLVerifier:
             'counterexample': None
         }
         
-        # Parse standard output for result
-        if 'EQUIVALENT' in stdout.upper():
+        # Parse standard output for result; uppercase once, probe thrice
+        upper = stdout.upper()
+        if 'EQUIVALENT' in upper:
             result['result'] = 'equivalent'
-        elif 'NOT EQUIVALENT' in stdout.upper() or 'COUNTEREXAMPLE' in stdout.upper():
+        elif 'NOT EQUIVALENT' in upper or 'COUNTEREXAMPLE' in upper:
             result['result'] = 'not_equivalent'
             # Extract counterexample if available
             if 'COUNTEREXAMPLE' in stdout:
@@ -1,9 +1,22 @@
-from typing import Dict, Any, List, Tuple
+import hashlib
+import json
+import os
+import re
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Tuple, Sequence
 from dataclasses import dataclass
 from enum import Enum
 
-from core.query_parser import SQLParser
+from core.query_parser import SQLParser, has_top_level_or, split_conjuncts
 from core.transpiler import CypherToSQLTranspiler
+from core._fastnorm import normalize_sql
+
+_WHERE_RE = re.compile(r'\bwhere\s+(.+?)(?=\s+(?:group|having|order|limit)\b|$)')
+
+# canonical digests keyed by raw SQL text; repeated verifications of the
+# same query skip normalization and parsing entirely
+_canon_cache: Dict[str, bytes] = {}
 
 class VerificationResult(Enum):
     EQUIVALENT = "equivalent"
@@ -19,6 +32,13 @@ class EquivalenceReport:
     checked_bound: int = None
     details: Dict[str, Any] = None
 
+def _verify_one(args) -> 'EquivalenceReport':
+    # module-level so ProcessPoolExecutor can pickle it; bound methods of
+    # EquivalenceVerifier do not pickle safely across processes
+    cypher_query, sql_query, schema, backend, timeout = args
+    return EquivalenceVerifier(backend=backend).verify(cypher_query, sql_query, schema, timeout)
+
+
 class EquivalenceVerifier:
     """Verifies equivalence between Cypher and SQL queries"""
     
@@ -28,17 +48,35 @@ class EquivalenceVerifier:
         """
         self.backend = backend
         self.sql_parser = SQLParser()
-        
-    def verify(self, cypher_query: str, sql_query: str, 
+        # transpilers keyed by schema digest; verify() is typically called
+        # many times against the same schema
+        self._transpiler_cache: 'OrderedDict[bytes, CypherToSQLTranspiler]' = OrderedDict()
+
+    _TRANSPILER_CACHE_SIZE = 32
+
+    def _transpiler_for(self, schema: Dict[str, Any]) -> CypherToSQLTranspiler:
+        """Return a (possibly cached) transpiler for the given schema"""
+        key = hashlib.blake2b(
+            json.dumps(schema, sort_keys=True, default=str).encode()).digest()
+        transpiler = self._transpiler_cache.get(key)
+        if transpiler is None:
+            transpiler = CypherToSQLTranspiler(schema)
+            if len(self._transpiler_cache) >= self._TRANSPILER_CACHE_SIZE:
+                self._transpiler_cache.popitem(last=False)
+            self._transpiler_cache[key] = transpiler
+        else:
+            self._transpiler_cache.move_to_end(key)
+        return transpiler
+
+    def verify(self, cypher_query: str, sql_query: str,
                schema: Dict[str, Any], timeout: int = 600) -> EquivalenceReport:
         """Verify equivalence between queries"""
-        
+
         import time
         start_time = time.time()
-        
+
         # Transpile Cypher to SQL
-        transpiler = CypherToSQLTranspiler(schema)
-        transpiled_sql = transpiler.transpile(cypher_query)
+        transpiled_sql = self._transpiler_for(schema).transpile(cypher_query)
         
         # Compare with provided SQL
         if self.backend == "verieql":
@@ -51,15 +89,66 @@ class EquivalenceVerifier:
         
         return result
     
+    def verify_many(self, pairs: Sequence[Tuple[str, str]], schema: Dict[str, Any],
+                    timeout: int = 600, workers: int = None) -> List['EquivalenceReport']:
+        """Verify a batch of (cypher, sql) pairs across worker processes
+
+        Transpilation and canonicalization are CPU-bound Python, so a
+        process pool (not threads) gives the speedup; results come back
+        in input order.
+        """
+        pairs = list(pairs)
+        if not pairs:
+            return []
+
+        workers = min(workers or os.cpu_count() or 1, len(pairs))
+        if workers <= 1:
+            return [self.verify(cypher, sql, schema, timeout) for cypher, sql in pairs]
+
+        tasks = [(cypher, sql, schema, self.backend, timeout) for cypher, sql in pairs]
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_verify_one, tasks, chunksize=chunksize))
+
+    def _canonicalize(self, sql: str) -> Tuple[str, bytes]:
+        """Canonicalize SQL and return (canonical text, cached digest)
+
+        Normalizes case/whitespace, then sorts the AND-conjuncts of the
+        WHERE clause so commutative reorderings compare equal. Only the
+        WHERE clause is rewritten -- regex-based parsing is lossy, so
+        rebuilding the whole query from parsed parts could equate
+        queries that differ in clauses the parser drops. A WHERE with a
+        top-level OR is left untouched: its ANDs are OR-branch operands,
+        and reordering them across the OR would equate queries that
+        group differently.
+        """
+        norm = normalize_sql(sql)
+        digest = _canon_cache.get(norm)
+        if digest is not None:
+            return norm, digest
+
+        canonical = norm
+        where_match = _WHERE_RE.search(norm)
+        where = where_match.group(1) if where_match else None
+        if where and not has_top_level_or(where):
+            conjuncts = sorted(split_conjuncts(where))
+            canonical = norm.replace(where, ' and '.join(conjuncts), 1)
+
+        digest = hashlib.blake2b(canonical.encode()).digest()
+        _canon_cache[norm] = digest
+        return norm, digest
+
     def _verify_with_verieql(self, sql1: str, sql2: str, timeout: int) -> EquivalenceReport:
-        """Bounded equivalence checking using VeriEQL approach (simple string comparison)"""
-        # Normalize SQL (remove whitespace, lowercase)
-        norm1 = ' '.join(sql1.lower().split())
-        norm2 = ' '.join(sql2.lower().split())
-        if norm1 == norm2:
+        """Bounded equivalence checking using VeriEQL approach (canonical-hash comparison)"""
+        if sql1 == sql2:
+            # byte-identical queries need no canonicalization at all
+            norm1 = norm2 = normalize_sql(sql1)
             result = VerificationResult.EQUIVALENT
         else:
-            result = VerificationResult.NOT_EQUIVALENT
+            norm1, digest1 = self._canonicalize(sql1)
+            norm2, digest2 = self._canonicalize(sql2)
+            result = (VerificationResult.EQUIVALENT if digest1 == digest2
+                      else VerificationResult.NOT_EQUIVALENT)
 
         report = EquivalenceReport(
             result=result,
@@ -73,19 +162,21 @@ class EquivalenceVerifier:
             }
         )
         return report
-    
+
     def _verify_with_mediator(self, sql1: str, sql2: str, timeout: int) -> EquivalenceReport:
         """Full equivalence checking using Mediator approach"""
-        
+
         # Simulate Mediator verification
         # In production, integrate actual Mediator tool
-        
-        norm1 = ' '.join(sql1.lower().split())
-        norm2 = ' '.join(sql2.lower().split())
-        if norm1 == norm2:
+
+        if sql1 == sql2:
+            norm1 = norm2 = normalize_sql(sql1)
             result = VerificationResult.EQUIVALENT
         else:
-            result = VerificationResult.NOT_EQUIVALENT
+            norm1, digest1 = self._canonicalize(sql1)
+            norm2, digest2 = self._canonicalize(sql2)
+            result = (VerificationResult.EQUIVALENT if digest1 == digest2
+                      else VerificationResult.NOT_EQUIVALENT)
 
         report = EquivalenceReport(
             result=result,
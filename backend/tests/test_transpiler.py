@@ -2,7 +2,8 @@
 
 import unittest
 from core.advanced_transpiler import AdvancedCypherTranspiler
-from core.query_parser import CypherParser, SQLParser
+from core.query_parser import CypherParser, SQLParser, has_top_level_or, split_conjuncts
+from core.transformer_engine import DatabaseTransformer, TransformationRule
 
 class TestCypherToSQLTranspilation(unittest.TestCase):
     
@@ -79,5 +80,134 @@ class TestEquivalenceVerification(unittest.TestCase):
         self.assertEqual(result.result.value, 'not_equivalent')
 
 
+class TestPredicateHelpers(unittest.TestCase):
+
+    def test_split_simple_conjunction(self):
+        """Test splitting on top-level ANDs"""
+        self.assertEqual(split_conjuncts('a = 1 AND b = 2 and c = 3'),
+                         ['a = 1', 'b = 2', 'c = 3'])
+
+    def test_split_keeps_quoted_and(self):
+        """Test that AND inside a string literal does not split"""
+        self.assertEqual(split_conjuncts("a = 'x and y' AND b = 2"),
+                         ["a = 'x and y'", 'b = 2'])
+
+    def test_split_keeps_parenthesized_and(self):
+        """Test that AND inside parens does not split"""
+        self.assertEqual(split_conjuncts('(a = 1 and b = 2) AND c = 3'),
+                         ['(a = 1 and b = 2)', 'c = 3'])
+
+    def test_split_keeps_or_group_whole(self):
+        """Test that a parenthesized OR group stays one conjunct"""
+        self.assertEqual(split_conjuncts('a = 1 AND (b = 2 OR c = 3)'),
+                         ['a = 1', '(b = 2 OR c = 3)'])
+
+    def test_split_returns_top_level_or_whole(self):
+        """Test that a top-level OR disables splitting entirely"""
+        # AND binds tighter than OR; the ANDs here are OR-branch operands
+        self.assertEqual(split_conjuncts('a = 1 AND b = 2 OR c = 3'),
+                         ['a = 1 AND b = 2 OR c = 3'])
+
+    def test_top_level_or_detected(self):
+        """Test top-level OR detection"""
+        self.assertTrue(has_top_level_or('a = 1 or b = 2'))
+        self.assertTrue(has_top_level_or('(a = 1) or (b = 2)'))
+
+    def test_nested_or_not_top_level(self):
+        """Test that OR inside parens or quotes is not top-level"""
+        self.assertFalse(has_top_level_or('(a or b) and c'))
+        self.assertFalse(has_top_level_or("name = 'x or y'"))
+
+
+class TestBatchVerification(unittest.TestCase):
+
+    def test_transpile_many_matches_scalar(self):
+        """Test that the batch transpile API matches per-query results"""
+        from core.transpiler import CypherToSQLTranspiler, transpile_many
+        queries = [
+            "MATCH (n:Person) RETURN n.name",
+            "MATCH (n:Person) WHERE n.age > 30 RETURN n.name",
+        ]
+        transpiler = CypherToSQLTranspiler(None)
+        expected = [transpiler.transpile(query) for query in queries]
+
+        self.assertEqual(transpile_many(queries, None, workers=1), expected)
+
+    def test_verify_many_matches_scalar(self):
+        """Test that the batch verify API matches per-pair results in order"""
+        from core.verifier import EquivalenceVerifier
+        verifier = EquivalenceVerifier()
+        pairs = [
+            ("MATCH (n:Person) RETURN n.id, n.name", "SELECT id, name FROM Person"),
+            ("MATCH (n:Person) WHERE n.age > 25 RETURN n.name",
+             "SELECT name FROM Person WHERE age > 30"),
+        ]
+        expected = [verifier.verify(cypher, sql, {}).result for cypher, sql in pairs]
+
+        reports = verifier.verify_many(pairs, {}, workers=1)
+        self.assertEqual([report.result for report in reports], expected)
+
+
+class TestTransformerComposition(unittest.TestCase):
+
+    def setUp(self):
+        self.transformer = DatabaseTransformer()
+
+    def test_compose_matching_rules(self):
+        """Test that matching target/source predicates compose"""
+        t1 = DatabaseTransformer()
+        t1.rules.append(TransformationRule(
+            source_predicates=['Person(id, name)'],
+            target_predicate='R_Person(id, name)'
+        ))
+        t2 = DatabaseTransformer()
+        t2.rules.append(TransformationRule(
+            source_predicates=['R_Person(id, name)'],
+            target_predicate='R2_Person(id, name)'
+        ))
+
+        composed = self.transformer.compose_transformers(t1, t2)
+
+        self.assertEqual(len(composed.rules), 1)
+        self.assertEqual(composed.rules[0].source_predicates, ['Person(id, name)'])
+        self.assertEqual(composed.rules[0].target_predicate, 'R2_Person(id, name)')
+
+    def test_compose_non_matching_rules(self):
+        """Test that unrelated rules do not compose"""
+        t1 = DatabaseTransformer()
+        t1.rules.append(TransformationRule(
+            source_predicates=['Person(id)'],
+            target_predicate='R_Person(id)'
+        ))
+        t2 = DatabaseTransformer()
+        t2.rules.append(TransformationRule(
+            source_predicates=['R_Company(id)'],
+            target_predicate='R2_Company(id)'
+        ))
+
+        composed = self.transformer.compose_transformers(t1, t2)
+
+        self.assertEqual(composed.rules, [])
+
+    def test_compose_combines_conditions(self):
+        """Test that composed rules AND their conditions with precedence kept"""
+        t1 = DatabaseTransformer()
+        t1.rules.append(TransformationRule(
+            source_predicates=['Person(id)'],
+            target_predicate='R_Person(id)',
+            condition='c = 3'
+        ))
+        t2 = DatabaseTransformer()
+        t2.rules.append(TransformationRule(
+            source_predicates=['R_Person(id)'],
+            target_predicate='R2_Person(id)',
+            condition='(a = 1) or (b = 2)'
+        ))
+
+        composed = self.transformer.compose_transformers(t1, t2)
+
+        self.assertEqual(composed.rules[0].condition, 'c = 3 AND ((a = 1) or (b = 2))')
+
+
 if __name__ == '__main__':
     unittest.main()